@@ -0,0 +1,117 @@
+"""
+Compiled pricing kernels for the real-time (per-event) streaming path.
+
+Numba versions of the three PS models working on plain numbers only:
+traffic level and vehicle type arrive as integer codes (indexes into
+TRAFFIC_LEVELS / VEHICLE_TYPES), encoded upstream in
+prepare_data_for_streaming. m3_fused is the batched variant, taking
+arrays of precomputed occupancy ratios and encoded weights. cache=True
+keeps the compiled code on disk so restarts skip the JIT step.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# PS feature encodings: code -> label and code -> weight
+TRAFFIC_LEVELS = ('low', 'average', 'high')
+TRAFFIC_WEIGHTS = np.array([0.0, 0.5, 1.0])
+VEHICLE_TYPES = ('car', 'bike', 'truck', 'cycle')
+VEHICLE_WEIGHTS = np.array([1.0, 0.5, 1.5, 0.3])
+
+# Codes used for unknown labels ('average' traffic, 'car' weight)
+DEFAULT_TRAFFIC_CODE = 1
+DEFAULT_VEHICLE_CODE = 0
+
+
+@njit(cache=True)
+def m1(occupancy, capacity, prev_price, alpha):
+    """Model 1: Price_t+1 = Price_t + α × (Occupancy/Capacity), bounded to [$5, $30]"""
+    occupancy_ratio = occupancy / capacity if capacity > 0 else 0.0
+    new_price = prev_price + alpha * occupancy_ratio
+    return max(5.0, min(new_price, 30.0))
+
+
+@njit(cache=True)
+def _demand_price(occupancy_ratio, queue_length, traffic_weight, is_special_day, vehicle_weight,
+                  base_price, params):
+    """Model 2 core on encoded inputs: PS demand formula → bounded price"""
+    alpha, beta, gamma, delta, epsilon, lambda_param = params
+
+    demand = (alpha * occupancy_ratio +
+              beta * queue_length -
+              gamma * traffic_weight +
+              delta * is_special_day +
+              epsilon * vehicle_weight)
+
+    normalized_demand = max(0.0, min(demand, 1.0))
+    price = base_price * (1 + lambda_param * normalized_demand)
+
+    return max(base_price * 0.5, min(price, base_price * 2))
+
+
+@njit(cache=True)
+def _competitive_price(demand_price, occupancy_rate, competitor_price):
+    """Model 3 competitive step on top of a Model 2 price, bounded to [$5, $20]"""
+    if occupancy_rate > 0.8:
+        # Lot full and competitors cheaper → raise price to reroute
+        if competitor_price < demand_price:
+            competitive_price = demand_price * 1.2
+        else:
+            competitive_price = demand_price
+    else:
+        # Competitors expensive → increase while staying attractive
+        if competitor_price > demand_price:
+            competitive_price = min(demand_price * 1.1, competitor_price * 0.95)
+        else:
+            competitive_price = demand_price
+
+    return max(5.0, min(competitive_price, 20.0))
+
+
+@njit(cache=True)
+def m2(occupancy, capacity, queue_length, traffic_code, is_special_day, vehicle_code,
+       base_price, params):
+    """Model 2: demand-based price; params = (α, β, γ, δ, ε, λ)"""
+    occupancy_ratio = occupancy / capacity if capacity > 0 else 0.0
+    return _demand_price(occupancy_ratio, queue_length, TRAFFIC_WEIGHTS[traffic_code],
+                         is_special_day, VEHICLE_WEIGHTS[vehicle_code], base_price, params)
+
+
+@njit(cache=True)
+def m3(occupancy, capacity, queue_length, traffic_code, is_special_day, vehicle_code,
+       competitor_price, base_price, params):
+    """Model 3: competitive adjustment on top of the Model 2 price"""
+    demand_price = m2(occupancy, capacity, queue_length, traffic_code, is_special_day,
+                      vehicle_code, base_price, params)
+    occupancy_rate = occupancy / capacity if capacity > 0 else 0.0
+    return _competitive_price(demand_price, occupancy_rate, competitor_price)
+
+
+@njit(parallel=True, cache=True)
+def m3_fused(occupancy_ratio, queue_length, traffic_weight, is_special_day, vehicle_weight,
+             competitor_price, base_price, params):
+    """
+    Model 3 over whole arrays in a single pass: demand, Model 2 price and the
+    competitive step stay in locals, only the final price is written out.
+    """
+    n = occupancy_ratio.shape[0]
+    out = np.empty(n)
+    for i in prange(n):
+        demand_price = _demand_price(occupancy_ratio[i], queue_length[i], traffic_weight[i],
+                                     is_special_day[i], vehicle_weight[i], base_price, params)
+        out[i] = _competitive_price(demand_price, occupancy_ratio[i], competitor_price)
+    return out
+
+
+def warm_up(base_price, alpha, params):
+    """
+    Compile (or load from the on-disk cache) every kernel for the argument
+    types the app uses, so the first streamed event pays no JIT latency.
+    """
+    m1(1, 1, base_price, alpha)
+    m2(1, 1, 1, DEFAULT_TRAFFIC_CODE, 0, DEFAULT_VEHICLE_CODE, base_price, params)
+    m3(1, 1, 1, DEFAULT_TRAFFIC_CODE, 0, DEFAULT_VEHICLE_CODE, 12.0, base_price, params)
+
+    # Batched path: same dtypes as the streaming payload (float64 ratio, narrow rest)
+    m3_fused(np.zeros(1), np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.float32),
+             np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.float32), 12.0, base_price, params)
@@ -0,0 +1,26 @@
+"""Checks for the compiled pricing kernels (run with `python -m pytest` from the repo root)"""
+
+import numpy as np
+
+from _pricing_kernels import TRAFFIC_LEVELS, TRAFFIC_WEIGHTS, VEHICLE_TYPES, VEHICLE_WEIGHTS, m3, m3_fused
+from final_ps_compliant import PSCompliantParkingPricing
+
+
+def test_m3_fused_matches_m3_at_occupancy_threshold():
+    """Batched Model 3 on the streaming dtypes agrees with the scalar kernel at exactly 80%"""
+    pricing = PSCompliantParkingPricing()
+    # Inputs sit exactly on the 80% occupancy threshold, where a rounded ratio would
+    # flip Model 3 into the "lot full" branch (float32(0.8) > 0.8)
+    occupancy, capacity, queue_length = 400, 500, 0
+    traffic_code, vehicle_code = TRAFFIC_LEVELS.index('high'), VEHICLE_TYPES.index('bike')
+
+    fused = m3_fused(np.array([occupancy / capacity]),
+                     np.array([queue_length], dtype=np.int8),
+                     TRAFFIC_WEIGHTS[[traffic_code]].astype(np.float32),
+                     np.zeros(1, dtype=np.int8),
+                     VEHICLE_WEIGHTS[[vehicle_code]].astype(np.float32),
+                     12.0, pricing.base_price, pricing.demand_params)[0]
+    scalar = m3(occupancy, capacity, queue_length, traffic_code, 0, vehicle_code,
+                12.0, pricing.base_price, pricing.demand_params)
+
+    assert abs(fused - scalar) <= 1e-6
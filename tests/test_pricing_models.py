@@ -0,0 +1,51 @@
+"""Checks for the vectorized PS pricing models (run with `python -m pytest` from the repo root)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from final_ps_compliant import PSCompliantParkingPricing
+
+# (occupancy, capacity, queue, traffic, special day, vehicle) covering both Model 3 branches
+SCENARIOS = pd.DataFrame({
+    "occ": [50, 200, 450, 300, 200, 480],
+    "cap": [577, 577, 577, 577, 577, 500],
+    "queue": [1, 3, 8, 5, 3, 2],
+    "traffic": ["low", "average", "high", "High", "average", "low"],
+    "special": [0, 0, 0, 1, 0, 0],
+    "vehicle": ["car", "car", "car", "Car", "truck", "bike"],
+})
+
+
+@pytest.fixture
+def pricing():
+    return PSCompliantParkingPricing()
+
+
+def _scalar_prices(model, *columns):
+    return np.array([model(*row) for row in zip(*columns)])
+
+
+def test_vec_models_accept_series(pricing):
+    """Every *_vec entry point takes pandas Series (read-only views under copy-on-write)"""
+    s = SCENARIOS
+    args = (s["occ"], s["cap"], s["queue"], s["traffic"], s["special"], s["vehicle"])
+    ratio = s["occ"] / s["cap"]
+    traffic_weight = pd.Series([0.0, 0.5, 1.0, 1.0, 0.5, 0.0])
+    vehicle_weight = pd.Series([1.0, 1.0, 1.0, 1.0, 1.5, 0.5])
+
+    expected_1 = _scalar_prices(pricing.model_1_baseline_linear, s["occ"], s["cap"])
+    expected_2 = _scalar_prices(pricing.model_2_demand_based, *args)
+    expected_3 = _scalar_prices(pricing.model_3_competitive_pricing, *args)
+
+    np.testing.assert_allclose(pricing.model_1_baseline_linear_vec(s["occ"], s["cap"]), expected_1)
+    np.testing.assert_allclose(pricing.model_1_from_ratio_vec(ratio), expected_1)
+    np.testing.assert_allclose(
+        pricing.model_1_from_ratio_vec(ratio, prev_price=pd.Series(np.full(len(s), 10.0))), expected_1)
+    np.testing.assert_allclose(pricing.model_2_demand_based_vec(*args), expected_2)
+    np.testing.assert_allclose(
+        pricing.model_2_from_ratio_vec(ratio, s["queue"], traffic_weight, s["special"], vehicle_weight),
+        expected_2)
+    np.testing.assert_allclose(pricing.model_3_competitive_pricing_vec(*args), expected_3)
+    np.testing.assert_allclose(
+        pricing.model_3_from_demand_price_vec(pd.Series(expected_2), ratio), expected_3)